@@ -2,99 +2,112 @@
 AI-Democracy Anticipatory Signal Scanner
 Scenarios: Vahvistuu / Uusi demokratia / Heikentyy / Romahtaa
 ------------------------------------------------------------------
-Install dependencies: pip install anthropic feedparser requests
+Install dependencies: pip install anthropic feedparser orjson requests
 Run manually:         python scanner.py
+Real-time mode:       CLASSIFY_MODE=async python scanner.py
+One shard of feeds:   python scanner.py --shard 0/4   (shards run one after another)
+Parse in N processes: python scanner.py --workers 4
 """
 
 import anthropic
+import argparse
+import asyncio
+import fcntl
 import feedparser
-import json
+import functools
+import hashlib
+import logging
+import orjson
 import os
+import re
+import sqlite3
 import time
+import tomllib
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+
+log = logging.getLogger("scanner")
 
 # ── API KEY ───────────────────────────────────────────────────────────────────
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
 
 # ── NEWS FEEDS ────────────────────────────────────────────────────────────────
-RSS_FEEDS = {
-    # Finnish sources
-    "yle_uutiset":      "https://feeds.yle.fi/uutiset/v1/recent.rss?publisherIds=YLE_UUTISET",
-    "yle_tekno":        "https://feeds.yle.fi/uutiset/v1/recent.rss?publisherIds=YLE_UUTISET&concepts=18-34837",
-    "yle_politiikka":   "https://feeds.yle.fi/uutiset/v1/recent.rss?publisherIds=YLE_UUTISET&concepts=18-38033",
-    "mtv_uutiset":      "https://www.mtvuutiset.fi/rss/uutiset.rss",
-
-    # Finnish government & institutions
-    "valtioneuvosto":   "https://valtioneuvosto.fi/rss/tiedotteet.rss",
-    "eduskunta":        "https://www.eduskunta.fi/FI/tiedotteet/Sivut/RSS.aspx",
-    "oikeusministerio": "https://oikeusministerio.fi/rss/tiedotteet.rss",
-    "traficom":         "https://www.traficom.fi/fi/rss/uutiset",
-
-    # EU policy & governance
-    "euractiv_digital": "https://www.euractiv.com/sections/digital/feed/",
-    "euractiv_ai":      "https://www.euractiv.com/sections/digital/artificial-intelligence/feed/",
-    "eu_commission":    "https://ec.europa.eu/newsroom/dae/rss.cfm",
-    "europarl":         "https://www.europarl.europa.eu/rss/doc/top-stories/en.xml",
-    "edri":             "https://edri.org/feed/",
-
-    # Global news
-    "reuters_tech":     "https://feeds.reuters.com/reuters/technologyNews",
-    "bbc_tech":         "https://feeds.bbci.co.uk/news/technology/rss.xml",
-    "ap_tech":          "https://feeds.apnews.com/rss/apf-technology",
-
-    # Democracy & governance research
-    "freedom_house":    "https://freedomhouse.org/rss.xml",
-    "v_dem":            "https://www.v-dem.net/feed/",
-    "carnegie_dem":     "https://carnegieendowment.org/topics/democracy/rss",
-    "brookings_gov":    "https://www.brookings.edu/topic/governance-studies/feed/",
-    "oxpol":            "https://blog.politics.ox.ac.uk/feed/",
-
-    # Disinformation & information environment
-    "euvsdisinfo":      "https://euvsdisinfo.eu/feed/",
-    "firstdraft":       "https://firstdraftnews.org/feed/",
-    "poynter":          "https://www.poynter.org/feed/",
-
-    # ── NEW: Radical signal sources ──────────────────────────────────────────
-
-    # Crisis & conflict early warning
-    "crisis_group":     "https://www.crisisgroup.org/rss.xml",
-    "civicus":          "https://www.civicus.org/index.php/feed",
-    "international_idea": "https://www.idea.int/rss.xml",
-
-    # Investigative / backsliding monitoring
-    "occrp":            "https://www.occrp.org/en/rss",
-    "vsquare":          "https://vsquare.org/feed/",
-
-    # Governance innovation & futures
-    "nesta":            "https://www.nesta.org.uk/feed/",
-    "govinsider":       "https://govinsider.asia/feed/",
-    "apolitical":       "https://apolitical.co/feed",
-
-    # Academic / speculative
-    "ssrn_polisci":     "https://papers.ssrn.com/rss/SSRN_GetFile.cfm?abstractid=&ContentType=topTen&network=Political+Science+Network",
-    "lawfare":          "https://www.lawfaremedia.org/feed",
-    "verfassungsblog":  "https://verfassungsblog.de/feed/",  # Constitutional law & democracy
-
-    # GDELT targeted queries
-    "gdelt_ai_dem":     "https://api.gdeltproject.org/api/v2/doc/doc?query=AI+democracy&mode=artlist&format=rss",
-    "gdelt_ai_elect":   "https://api.gdeltproject.org/api/v2/doc/doc?query=artificial+intelligence+elections&mode=artlist&format=rss",
-    "gdelt_disinfo":    "https://api.gdeltproject.org/api/v2/doc/doc?query=disinformation+AI+politics&mode=artlist&format=rss",
-    "gdelt_autocracy":  "https://api.gdeltproject.org/api/v2/doc/doc?query=AI+autocracy+surveillance+democracy&mode=artlist&format=rss",
-    "gdelt_new_dem":    "https://api.gdeltproject.org/api/v2/doc/doc?query=AI+deliberative+democracy+participation+new&mode=artlist&format=rss",
-}
+# Feed list lives in FEEDS_FILE so operators can edit it without touching code.
+# Entries are normalized to {"url": ..., "topical": bool}.
+@functools.cache
+def load_feeds() -> dict:
+    with open(FEEDS_FILE, "rb") as f:
+        feeds = tomllib.load(f)["feeds"]
+    return {source: {"url": cfg, "topical": False} if isinstance(cfg, str)
+            else {"url": cfg["url"], "topical": bool(cfg.get("topical", False))}
+            for source, cfg in feeds.items()}
 
 # ── SETTINGS ──────────────────────────────────────────────────────────────────
+FEEDS_FILE          = "feeds.toml"
 ARTICLES_PER_FEED   = 20
-OUTPUT_FILE         = "signals.json"
+OUTPUT_FILE         = "signals.jsonl"
+SEEN_DB             = "signals.db"
+CACHE_FILE          = "classify_cache.json"
+CACHE_MAX_AGE_DAYS  = 14
+PROMPT_VERSION      = 2       # bump when the rubric's meaning changes without a text change
+FEED_STATE_FILE     = "feed_state.json"
+BATCH_STATE_FILE    = "batch_state.json"
+LOCK_FILE           = ".scanner.lock"
+ARTICLE_FIELDS      = ("source", "title", "summary", "url", "published", "scanned_at")
 MODEL               = "claude-sonnet-4-6"
-MAX_TOKENS          = 700
+MODEL_TRIAGE        = "claude-haiku-4-5"
+TRIAGE_CONFIDENCE   = 0.6
+MIN_CONTENT_CHARS   = 60      # title + summary shorter than this is never classified
+MAX_TOKENS          = 400
 FEED_TIMEOUT        = 15
+FEED_WORKERS        = 10
+CONNECT_TIMEOUT     = 3.05
 API_RETRIES         = 3
 RETRY_BACKOFF       = 5
+BATCH_POLL_INTERVAL = 30
+BATCH_MAX_WAIT      = 5 * 3600  # seconds per run; GitHub Actions jobs stop at 6h
+CLASSIFY_MODE       = os.environ.get("CLASSIFY_MODE", "batch")   # "batch" or "async"
+MAX_CONCURRENT      = 10
+
+# ── KEYWORD PRE-FILTER ────────────────────────────────────────────────────────
+# Cheap first-stage gate: only articles mentioning AI or a democracy-related
+# topic (English or Finnish stems) are sent to the model at all. "AI" is
+# case-sensitive and may end a word (GenAI, OpenAI) but not start one ("aid").
+# Finnish stems have no leading \b, since they usually sit inside compounds
+# (aluevaalit, sosiaalidemokraatit, generatiivinen tekoäly).
+TOPIC_RE = re.compile(
+    r"(?-i:A\.?I\b)|\b("
+    r"artificial intelligence|machine learning|algorithm|automat|chatbot|chatgpt|openai|"
+    r"anthropic|copilot|gpt-?\d|deepfake|LLM|generative|genai|"
+    r"democra|election|voting|voter|disinform|misinform|propagand|"
+    r"surveillance|censor|regulat|GDPR|civic|parliament|authoritarian|autocra"
+    r")\w*|("
+    r"tekoäly|koneoppi|algoritm|automaati|demokra|vaali|äänest|valvon|sensuuri|"
+    r"säänte|kansalais|eduskun|autoritaar|disinformaa"
+    r")\w*",
+    re.IGNORECASE,
+)
+
+def is_candidate(article) -> bool:
+    # Topical feeds (GDELT queries etc.) are on-topic by construction and
+    # often title-only, so the gate would only lose recall there.
+    if load_feeds().get(article["source"], {}).get("topical"):
+        return True
+    return TOPIC_RE.search(article["title"] + " " + article["summary"]) is not None
 
 # ── CLASSIFICATION PROMPT ─────────────────────────────────────────────────────
-PROMPT = """
+# The rubric is identical for every article, so it is sent as a separate
+# content block marked for prompt caching. Caching only applies once tools +
+# rubric (about 1.3k tokens) exceed the model's minimum cacheable prefix:
+# that holds for Sonnet (1024) but not for the Haiku 4.5 triage pass (4096),
+# so the pass that sees every article pays full input price. The per-article
+# part is the news item fields followed by PROMPT_TAIL, joined directly
+# rather than via str.format so the template is not re-parsed per article.
+PROMPT_STATIC = """
 You are an anticipatory intelligence analyst specializing in AI's impact on democracy.
 
 Assess whether this news item is a relevant anticipatory signal about how AI is affecting
@@ -166,155 +179,644 @@ something that would NOT be predicted by extrapolating current trends? Mark true
   - sudden collapses or emergences that bypass incremental change
   - signals that would constitute a qualitative break, not just acceleration
   Mark false for signals that represent gradual continuation of existing dynamics.
+"""
 
-News item:
-TITLE: {title}
-SOURCE: {source}
-SUMMARY: {summary}
-
-Respond ONLY with valid JSON — no preamble, no markdown backticks:
-{{
-  "relevant": true or false,
-  "primary_category": "STRENGTHENS|NEW_DEMOCRACY|WEAKENS|COLLAPSE|AMBIGUOUS",
-  "secondary_categories": [],
-  "signal_strength": "weak|moderate|strong",
-  "signal_type": "emerging|accelerating|plateauing|reversing",
-  "domain": "epistemic|procedural|institutional|participatory|power|multiple",
-  "impact": 1-5,
-  "likelihood": 1-5,
-  "structural_break": true or false,
-  "confidence": 0.0 to 1.0,
-  "rationale": "2-3 sentences on the primary reading",
-  "secondary_rationale": "1-2 sentences on secondary dimensions, or empty string if none",
-  "finnish_relevance": true or false
-}}
+PROMPT_TAIL = """
+
+Record your assessment by calling the classify tool.
 """
 
+# The response schema is enforced through a forced tool call, so the reply
+# arrives as structured input rather than free text that has to be parsed.
+CATEGORIES = ["STRENGTHENS", "NEW_DEMOCRACY", "WEAKENS", "COLLAPSE", "AMBIGUOUS"]
+CLASSIFY_TOOL = {
+    "name": "classify",
+    "description": "Record the anticipatory-signal classification of one news item.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "relevant":             {"type": "boolean"},
+            "primary_category":     {"type": "string", "enum": CATEGORIES},
+            "secondary_categories": {"type": "array", "items": {"type": "string", "enum": CATEGORIES}},
+            "signal_strength":      {"type": "string", "enum": ["weak", "moderate", "strong"]},
+            "signal_type":          {"type": "string", "enum": ["emerging", "accelerating", "plateauing", "reversing"]},
+            "domain":               {"type": "string", "enum": ["epistemic", "procedural", "institutional",
+                                                               "participatory", "power", "multiple"]},
+            "impact":               {"type": "integer", "minimum": 1, "maximum": 5},
+            "likelihood":           {"type": "integer", "minimum": 1, "maximum": 5},
+            "structural_break":     {"type": "boolean"},
+            "confidence":           {"type": "number", "minimum": 0, "maximum": 1},
+            "rationale":            {"type": "string", "description": "2-3 sentences on the primary reading"},
+            "secondary_rationale":  {"type": "string", "description": "1-2 sentences on secondary dimensions, or empty string if none"},
+            "finnish_relevance":    {"type": "boolean"},
+        },
+        "required": ["relevant", "primary_category", "secondary_categories", "signal_strength",
+                     "signal_type", "domain", "impact", "likelihood", "structural_break",
+                     "confidence", "rationale", "secondary_rationale", "finnish_relevance"],
+    },
+}
+TOOL_CHOICE = {"type": "tool", "name": "classify"}
+
 # ── LOAD EXISTING SIGNALS ─────────────────────────────────────────────────────
-def load_existing():
+# signals.jsonl is append-only and committed by CI; signals.db is a local,
+# uncommitted URL index over it. The index remembers how many bytes of the
+# file it has covered plus the bytes just before that point, so after a
+# git pull only the appended tail is indexed. If the file shrank or was
+# rewritten, the index is rebuilt from scratch.
+MARKER_BYTES = 64
+
+def _file_marker(f, offset: int) -> str:
+    f.seek(max(0, offset - MARKER_BYTES))
+    return f.read(min(offset, MARKER_BYTES)).hex()
+
+def _set_indexed(db, f, offset: int):
+    db.executemany("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
+                   [("offset", str(offset)), ("marker", _file_marker(f, offset))])
+
+def _index_tail(db, f, offset: int) -> int:
+    # Indexes complete lines from offset on; returns the offset reached.
+    f.seek(offset)
+    dropped = 0
+    for line in f:
+        if not line.endswith(b"\n"):
+            break   # torn last line from an interrupted write; save() cuts it off
+        offset += len(line)
+        if not line.strip():
+            continue
+        try:
+            s = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            dropped += 1
+            continue
+        if isinstance(s, dict) and isinstance(s.get("url"), str) and s["url"]:
+            db.execute("INSERT OR IGNORE INTO seen(url) VALUES (?)", (s["url"],))
+        else:
+            dropped += 1
+    if dropped:
+        log.warning("  ⚠ Skipped %d malformed lines in %s", dropped, OUTPUT_FILE)
+    return offset
+
+def open_seen_db():
+    db = sqlite3.connect(SEEN_DB)
+    db.execute("CREATE TABLE IF NOT EXISTS seen(url TEXT PRIMARY KEY)")
+    db.execute("CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT)")
+    meta = dict(db.execute("SELECT key, value FROM meta"))
+    offset, marker = int(meta.get("offset", 0)), meta.get("marker", "")
     try:
-        with open(OUTPUT_FILE, encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, list):
-            print("  ⚠ signals.json is not a list — starting fresh")
-            return []
-        valid = [s for s in data if isinstance(s, dict) and isinstance(s.get("url"), str) and s["url"]]
-        if len(valid) < len(data):
-            print(f"  ⚠ Dropped {len(data)-len(valid)} malformed entries")
-        return valid
+        f = open(OUTPUT_FILE, "rb")
     except FileNotFoundError:
-        return []
-    except json.JSONDecodeError as e:
-        print(f"  ⚠ signals.json corrupt ({e}) — starting fresh")
-        return []
+        db.execute("DELETE FROM seen")
+        db.execute("DELETE FROM meta")
+        db.commit()
+        return db
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        if size < offset or _file_marker(f, offset) != marker:
+            log.info("  %s changed underneath the index — rebuilding", OUTPUT_FILE)
+            db.execute("DELETE FROM seen")
+            offset = 0
+        if size > offset:
+            offset = _index_tail(db, f, offset)
+        _set_indexed(db, f, offset)
+    db.commit()
+    return db
+
+# Looks up only this run's URLs against the primary-key index, instead of
+# materializing every URL ever seen into a Python set.
+def known_urls(db, urls: list) -> set:
+    found = set()
+    for i in range(0, len(urls), 500):
+        chunk = urls[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        found.update(row[0] for row in db.execute(f"SELECT url FROM seen WHERE url IN ({marks})", chunk))
+    return found
+
+# ── CLASSIFICATION CACHE ──────────────────────────────────────────────────────
+# Feeds keep advertising the same items for days, and irrelevant ones never
+# reach signals.jsonl, so without this they would be re-classified every run.
+def cache_key(article) -> str:
+    payload = article["url"] + article["title"] + article["summary"]
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# Everything that decides a verdict: models, cascade threshold, prompt and
+# schema. A cache written under a different fingerprint is discarded whole.
+def cache_fingerprint() -> str:
+    payload = orjson.dumps([PROMPT_VERSION, MODEL_TRIAGE, MODEL, TRIAGE_CONFIDENCE,
+                            PROMPT_STATIC, PROMPT_TAIL, CLASSIFY_TOOL])
+    return hashlib.sha256(payload).hexdigest()
+
+def load_cache() -> dict:
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+        if not isinstance(data, dict) or data.get("fingerprint") != cache_fingerprint():
+            log.info("  Classification cache is from another model/prompt — starting fresh")
+            return {}
+        entries = data.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+        return {k: v for k, v in entries.items()
+                if isinstance(v, dict) and isinstance(v.get("result"), dict)}
+    except FileNotFoundError:
+        return {}
+    except orjson.JSONDecodeError as e:
+        log.warning("  ⚠ %s corrupt (%s) — starting fresh", CACHE_FILE, e)
+        return {}
+
+def save_cache(cache: dict):
+    with open(CACHE_FILE, "wb") as f:
+        f.write(orjson.dumps({"fingerprint": cache_fingerprint(), "entries": cache}))
+
+# ── HTTP SESSION ──────────────────────────────────────────────────────────────
+# One pooled session for all feed requests, so worker threads reuse TCP/TLS
+# connections per host; transient errors are retried with backoff. Read
+# timeouts are not retried, so a stalled feed costs one FEED_TIMEOUT.
+SESSION = requests.Session()
+SESSION.headers["User-Agent"] = "Mozilla/5.0"
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, read=0, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"]),
+))
+SESSION.mount("http://", SESSION.get_adapter("https://"))
+
+# ── FEED STATE ────────────────────────────────────────────────────────────────
+# ETag / Last-Modified per source, so unchanged feeds answer 304 and are
+# neither downloaded nor parsed.
+def load_feed_state() -> dict:
+    try:
+        with open(FEED_STATE_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+        return data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except orjson.JSONDecodeError as e:
+        log.warning("  ⚠ %s corrupt (%s) — starting fresh", FEED_STATE_FILE, e)
+        return {}
+
+def save_feed_state(state: dict):
+    with open(FEED_STATE_FILE, "wb") as f:
+        f.write(orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
 
 # ── FETCH ARTICLES ────────────────────────────────────────────────────────────
-def fetch_articles(existing_urls: set) -> list:
+def _fetch_one(source: str, url: str, state: dict) -> tuple:
     articles = []
-    for source, url in RSS_FEEDS.items():
-        try:
-            response = requests.get(url, timeout=FEED_TIMEOUT, headers={"User-Agent": "Mozilla/5.0"})
-            response.raise_for_status()
-            feed = feedparser.parse(response.content)
-            new_count = 0
-            for entry in feed.entries[:ARTICLES_PER_FEED]:
-                article_url = entry.get("link", "").strip()
-                if not article_url or article_url in existing_urls:
-                    continue
-                articles.append({
-                    "source":    source,
-                    "title":     entry.get("title", "").strip()[:300],
-                    "summary":   entry.get("summary", "")[:800].strip(),
-                    "url":       article_url,
-                    "published": entry.get("published", ""),
-                })
-                new_count += 1
-            print(f"  ✓ {source}: {new_count} new articles")
-        except requests.Timeout:
-            print(f"  ✗ {source}: timed out after {FEED_TIMEOUT}s")
-        except Exception as e:
-            print(f"  ✗ {source}: {e}")
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("modified"):
+        headers["If-Modified-Since"] = state["modified"]
+    try:
+        response = SESSION.get(url, timeout=(CONNECT_TIMEOUT, FEED_TIMEOUT), headers=headers)
+        if response.status_code == 304:
+            log.info("  · %s: not modified", source)
+            return [], state
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
+        entries = feed.entries[:ARTICLES_PER_FEED]
+        for entry in entries:
+            article_url = entry.get("link", "").strip()
+            if not article_url:
+                continue
+            articles.append({
+                "source":    source,
+                "title":     entry.get("title", "").strip()[:300],
+                "summary":   entry.get("summary", ""),   # trimmed after the keyword gate
+                "url":       article_url,
+                "published": entry.get("published", ""),
+            })
+        new_state = {k: v for k, v in (("etag", response.headers.get("ETag")),
+                                       ("modified", response.headers.get("Last-Modified"))) if v}
+        log.info("  ✓ %s: %d/%d articles", source, len(articles), len(entries))
+        return articles, new_state
+    except requests.ConnectTimeout:
+        log.warning("  ✗ %s: could not connect within %ss", source, CONNECT_TIMEOUT)
+        return [], state
+    except requests.Timeout:
+        log.warning("  ✗ %s: timed out after %ss", source, FEED_TIMEOUT)
+        return [], state
+    except requests.ConnectionError as e:
+        # With read=0 the adapter reports an exhausted read timeout as a
+        # ConnectionError wrapping urllib3's MaxRetryError(ReadTimeoutError).
+        reason = getattr(e.args[0], "reason", None) if e.args else None
+        if isinstance(reason, ReadTimeoutError):
+            log.warning("  ✗ %s: timed out after %ss", source, FEED_TIMEOUT)
+        else:
+            log.warning("  ✗ %s: %s", source, e)
+        return [], state
+    except Exception as e:
+        log.warning("  ✗ %s: %s", source, e)
+        return [], state
+
+def fetch_articles(feeds: dict, feed_state: dict) -> list:
+    # Feeds are IO-bound, so fetch them concurrently; one bad feed only
+    # costs its own slot in the pool. feed_state is updated in place.
+    articles = []
+    with ThreadPoolExecutor(max_workers=FEED_WORKERS) as ex:
+        futures = {ex.submit(_fetch_one, source, cfg["url"], feed_state.get(source, {})): source
+                   for source, cfg in feeds.items()}
+        for future in as_completed(futures):
+            feed_articles, state = future.result()
+            articles.extend(feed_articles)
+            if state:
+                feed_state[futures[future]] = state
+            else:
+                feed_state.pop(futures[future], None)
+    return articles
+
+def _fetch_chunk(feeds: dict, feed_state: dict) -> tuple:
+    articles = fetch_articles(feeds, feed_state)
+    return articles, feed_state
+
+def fetch_articles_sharded(feeds: dict, feed_state: dict, workers: int) -> list:
+    # Feed parsing is CPU-bound once downloads overlap, so large feed lists
+    # are split across processes, each running its own thread pool.
+    items = list(feeds.items())
+    chunks = [dict(items[i::workers]) for i in range(workers)]
+    articles = []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = {ex.submit(_fetch_chunk, chunk,
+                             {s: feed_state[s] for s in chunk if s in feed_state}): chunk
+                   for chunk in chunks if chunk}
+        for future in as_completed(futures):
+            chunk_articles, chunk_state = future.result()
+            articles.extend(chunk_articles)
+            for source in futures[future]:
+                feed_state.pop(source, None)
+            feed_state.update(chunk_state)
     return articles
 
 # ── CLASSIFY ONE ARTICLE ──────────────────────────────────────────────────────
-def classify(client, article) -> dict:
-    prompt = PROMPT.format(
-        title=article["title"],
-        source=article["source"],
-        summary=article["summary"],
-    )
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+def build_content(article) -> list:
+    return [
+        {"type": "text", "text": PROMPT_STATIC, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": (
+            f"News item:\nTITLE: {article['title']}\nSOURCE: {article['source']}\n"
+            f"SUMMARY: {article['summary']}{PROMPT_TAIL}"
+        )},
+    ]
+
+def tool_input(message) -> dict:
+    # A tool call cut off at max_tokens can carry a partial input that the
+    # defaults in parse_result would silently turn into a verdict.
+    if message.stop_reason == "max_tokens":
+        raise ValueError("response truncated at max_tokens")
+    for block in message.content:
+        if block.type == "tool_use" and isinstance(block.input, dict):
+            return block.input
+    raise ValueError("no classify tool call in response")
+
+def parse_result(article, data: dict, ts: str) -> dict:
+    result = dict(data)
+    result.setdefault("relevant", False)
+    result.setdefault("primary_category", "AMBIGUOUS")
+    result.setdefault("secondary_categories", [])
+    result.setdefault("impact", 1)
+    result.setdefault("likelihood", 1)
+    result.setdefault("structural_break", False)
+    result.setdefault("confidence", 0.0)
+    result.setdefault("rationale", "")
+    result.setdefault("secondary_rationale", "")
+    result.setdefault("finnish_relevance", False)
+    # Clamp impact/likelihood to valid range
+    result["impact"]     = max(1, min(5, int(result["impact"])))
+    result["likelihood"] = max(1, min(5, int(result["likelihood"])))
+    return {**article, **result, "scanned_at": ts}
+
+async def classify(client, sem, article, model=MODEL) -> dict:
+    ts = utc_now()
+    content = build_content(article)
     delay = RETRY_BACKOFF
     for attempt in range(1, API_RETRIES + 1):
         try:
-            response = client.messages.create(
-                model=MODEL,
-                max_tokens=MAX_TOKENS,
-                messages=[{"role": "user", "content": prompt}],
-                timeout=30,
-            )
-            raw = response.content[0].text.strip()
-            result = json.loads(raw)
-            result.setdefault("relevant", False)
-            result.setdefault("primary_category", "AMBIGUOUS")
-            result.setdefault("secondary_categories", [])
-            result.setdefault("impact", 1)
-            result.setdefault("likelihood", 1)
-            result.setdefault("structural_break", False)
-            result.setdefault("confidence", 0.0)
-            result.setdefault("rationale", "")
-            result.setdefault("secondary_rationale", "")
-            result.setdefault("finnish_relevance", False)
-            # Clamp impact/likelihood to valid range
-            result["impact"]     = max(1, min(5, int(result["impact"])))
-            result["likelihood"] = max(1, min(5, int(result["likelihood"])))
-            return {**article, **result, "scanned_at": datetime.utcnow().isoformat()}
-        except json.JSONDecodeError:
-            print(f"    JSON parse error (attempt {attempt}/{API_RETRIES})")
+            async with sem:
+                response = await client.messages.create(
+                    model=model,
+                    max_tokens=MAX_TOKENS,
+                    tools=[CLASSIFY_TOOL],
+                    tool_choice=TOOL_CHOICE,
+                    messages=[{"role": "user", "content": content}],
+                    timeout=30,
+                )
+            return parse_result(article, tool_input(response), ts)
+        except (ValueError, TypeError) as e:
+            log.warning("    Malformed response (attempt %d/%d): %s", attempt, API_RETRIES, e)
         except Exception as e:
-            print(f"    API error (attempt {attempt}/{API_RETRIES}): {e}")
+            log.warning("    API error (attempt %d/%d): %s", attempt, API_RETRIES, e)
         if attempt < API_RETRIES:
-            time.sleep(delay)
+            # Back off outside the semaphore so other requests keep flowing.
+            await asyncio.sleep(delay)
             delay *= 2
-    return {**article, "relevant": False, "error": "failed_after_retries",
-            "scanned_at": datetime.utcnow().isoformat()}
+    return {**article, "relevant": False, "error": "failed_after_retries", "scanned_at": ts}
 
-# ── SAVE RESULTS ──────────────────────────────────────────────────────────────
-def save(existing: list, new_signals: list):
-    combined = existing + new_signals
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(combined, f, ensure_ascii=False, indent=2)
-    print(f"\n✓ {len(new_signals)} new signals added. Total in database: {len(combined)}")
+# ── CLASSIFY ALL ARTICLES (REAL-TIME, CONCURRENT) ─────────────────────────────
+async def classify_async(articles: list, model=MODEL) -> list:
+    client = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+    sem = asyncio.Semaphore(MAX_CONCURRENT)
+    done = 0
 
-# ── MAIN ──────────────────────────────────────────────────────────────────────
-def main():
-    if not ANTHROPIC_API_KEY:
-        raise EnvironmentError("ANTHROPIC_API_KEY environment variable is not set.")
+    async def run(article):
+        nonlocal done
+        result = await classify(client, sem, article, model)
+        done += 1
+        log.info("  [%d/%d] %.55s...", done, len(articles), article["title"])
+        return result
+
+    try:
+        return await asyncio.gather(*(run(a) for a in articles))
+    finally:
+        await client.close()
+
+# ── TRIAGE CASCADE ────────────────────────────────────────────────────────────
+# A cheap triage pass over everything, then the full model only for items
+# triage thinks are relevant, is unsure about, or failed on.
+def needs_escalation(r) -> bool:
+    return (r.get("relevant") is True or "error" in r
+            or r.get("confidence", 0) < TRIAGE_CONFIDENCE)
+
+def escalation_input(r) -> dict:
+    return {k: r[k] for k in (*ARTICLE_FIELDS, "cache_key") if k in r}
+
+def classify_cascade_async(pending: list) -> list:
+    log.info("  Triage with %s", MODEL_TRIAGE)
+    triaged = asyncio.run(classify_async(pending, MODEL_TRIAGE))
+    escalate = [escalation_input(r) for r in triaged if needs_escalation(r)]
+    log.info("  Escalating %d/%d to %s", len(escalate), len(triaged), MODEL)
+    final = asyncio.run(classify_async(escalate, MODEL)) if escalate else []
+    return [r for r in triaged if not needs_escalation(r)] + final
+
+# ── CLASSIFY ALL ARTICLES (MESSAGE BATCHES) ───────────────────────────────────
+# Every batch is recorded in BATCH_STATE_FILE, together with its articles,
+# as soon as it is submitted, and only dropped once its results are in hand
+# (and, for triage, once the escalation batch is itself recorded). A run that
+# hits its deadline therefore never loses paid work: the next run picks up
+# whatever is still recorded.
+def load_batch_state() -> list:
+    try:
+        with open(BATCH_STATE_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+        return data if isinstance(data, list) else []
+    except FileNotFoundError:
+        return []
+    except orjson.JSONDecodeError as e:
+        log.warning("  ⚠ %s corrupt (%s) — starting fresh", BATCH_STATE_FILE, e)
+        return []
 
+def save_batch_state(state: list):
+    with open(BATCH_STATE_FILE, "wb") as f:
+        f.write(orjson.dumps(state))
+
+def submit_batch(client, articles: list, model: str):
+    batch = client.messages.batches.create(requests=[
+        {
+            "custom_id": f"art-{i}",
+            "params": {
+                "model":       model,
+                "max_tokens":  MAX_TOKENS,
+                "tools":       [CLASSIFY_TOOL],
+                "tool_choice": TOOL_CHOICE,
+                "messages":    [{"role": "user", "content": build_content(article)}],
+            },
+        }
+        for i, article in enumerate(articles)
+    ])
+    log.info("  Submitted %s batch %s with %d requests", model, batch.id, len(articles))
+    save_batch_state(load_batch_state() + [{"id": batch.id, "model": model, "articles": articles}])
+
+def drop_batch(batch_id: str):
+    save_batch_state([b for b in load_batch_state() if b.get("id") != batch_id])
+
+def collect_batch(client, batch_id: str, articles: list) -> list:
+    # Results stream back in completion order; slot them back by index so
+    # the output lines up with the recorded article list.
+    results = [None] * len(articles)
+    ts = utc_now()
+    for entry in client.messages.batches.results(batch_id):
+        i = int(entry.custom_id.removeprefix("art-"))
+        article = articles[i]
+        if entry.result.type != "succeeded":
+            log.warning("    Batch error (%s): %.55s", entry.result.type, article["title"])
+            results[i] = {**article, "relevant": False, "error": f"batch_{entry.result.type}",
+                          "scanned_at": ts}
+            continue
+        try:
+            results[i] = parse_result(article, tool_input(entry.result.message), ts)
+        except (ValueError, TypeError):
+            log.warning("    Malformed response: %.55s", article["title"])
+            results[i] = {**article, "relevant": False, "error": "malformed_response",
+                          "scanned_at": ts}
+    # Anything the batch didn't report back on is treated as a failure.
+    for i, article in enumerate(articles):
+        if results[i] is None:
+            results[i] = {**article, "relevant": False, "error": "missing_from_batch",
+                          "scanned_at": ts}
+    return results
+
+def classify_batches(pending: list, deadline: float) -> tuple:
+    # Runs the cascade over batches, including any left over from earlier
+    # runs. Returns (settled results, complete); complete is False when
+    # batches were still running at the deadline.
     client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    in_flight = {a["url"] for record in load_batch_state() for a in record["articles"]}
+    fresh = [a for a in pending if a["url"] not in in_flight]
+    if in_flight:
+        log.info("  Resuming %d recorded batches", len(load_batch_state()))
+    if fresh:
+        submit_batch(client, fresh, MODEL_TRIAGE)
+
+    settled = []
+    while state := load_batch_state():
+        progressed = False
+        for record in state:
+            batch = client.messages.batches.retrieve(record["id"])
+            if batch.processing_status != "ended":
+                counts = batch.request_counts
+                log.info("  … %s %s: %d processing, %d succeeded, %d errored", record["id"],
+                         batch.processing_status, counts.processing, counts.succeeded, counts.errored)
+                continue
+            results = collect_batch(client, record["id"], record["articles"])
+            if record["model"] == MODEL:
+                settled.extend(results)
+            else:
+                escalate = [escalation_input(r) for r in results if needs_escalation(r)]
+                log.info("  Escalating %d/%d to %s", len(escalate), len(results), MODEL)
+                if escalate:
+                    submit_batch(client, escalate, MODEL)
+                settled.extend(r for r in results if not needs_escalation(r))
+            drop_batch(record["id"])
+            progressed = True
+        if progressed:
+            continue
+        if time.monotonic() >= deadline:
+            log.info("  %d batches still running at the deadline — resuming next run", len(state))
+            return settled, False
+        time.sleep(BATCH_POLL_INTERVAL)
+    return settled, True
 
-    print("── Loading existing signals ─────────────────────────")
-    existing = load_existing()
-    existing_urls = {s["url"] for s in existing}
-    print(f"  {len(existing)} existing signals, {len(existing_urls)} known URLs")
+# ── SAVE RESULTS ──────────────────────────────────────────────────────────────
+def save(db, new_signals: list):
+    # Append-only: the URL index decides what is new, so existing signals are
+    # never re-read or re-serialized.
+    # Anything past the indexed offset is a torn line from an interrupted
+    # write (open_seen_db() has already indexed every complete line), so it
+    # is cut off rather than appended onto.
+    row = db.execute("SELECT value FROM meta WHERE key = 'offset'").fetchone()
+    added = 0
+    with open(OUTPUT_FILE, "ab+") as f:
+        if row and f.seek(0, os.SEEK_END) > int(row[0]):
+            log.warning("  ⚠ Dropping a partially written last line in %s", OUTPUT_FILE)
+            f.truncate(int(row[0]))
+        for sig in new_signals:
+            cur = db.execute("INSERT OR IGNORE INTO seen(url) VALUES (?)", (sig["url"],))
+            if cur.rowcount == 1:
+                f.write(orjson.dumps(sig) + b"\n")
+                added += 1
+        f.flush()
+        _set_indexed(db, f, f.seek(0, os.SEEK_END))
+    db.commit()
+    log.info("\n✓ %d new signals added to %s", added, OUTPUT_FILE)
+
+# ── MAIN ──────────────────────────────────────────────────────────────────────
+def parse_shard(value: str) -> tuple:
+    try:
+        index, count = (int(n) for n in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected i/N, e.g. 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError("shard index must satisfy 0 <= i < N")
+    return index, count
+
+def select_feeds(shard: tuple) -> dict:
+    # Deterministic slice by position, so N shards cover disjoint subsets.
+    # Shards only split the feed list: they share this checkout's state files,
+    # so they must run sequentially (e.g. on successive cron ticks).
+    index, count = shard
+    return dict(list(load_feeds().items())[index::count])
+
+# Every run loads signals.db, the cache, feed and batch state at start and
+# rewrites them at the end, so two runs on one checkout would overwrite each
+# other. The lock is held until the process exits.
+def acquire_lock():
+    f = open(LOCK_FILE, "w")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        f.close()
+        raise SystemExit(f"Another scanner run holds {LOCK_FILE}; shards must run one after another.")
+    return f
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI-Democracy anticipatory signal scanner")
+    parser.add_argument("--shard", type=parse_shard, default=(0, 1), metavar="i/N",
+                        help="only scan every N-th feed starting at i (default: all feeds); "
+                             "shards share state files and must not run concurrently")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="fetch and parse feeds in N processes (default: 1)")
+    args = parser.parse_args(argv)
 
-    print("\n── Fetching articles ────────────────────────────────")
-    articles = fetch_articles(existing_urls)
-    print(f"\n{len(articles)} new articles to classify")
+    if not ANTHROPIC_API_KEY:
+        raise EnvironmentError("ANTHROPIC_API_KEY environment variable is not set.")
 
-    if not articles:
-        print("Nothing new to classify.")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    lock = acquire_lock()  # held until the process exits
+
+    log.info("── Loading existing signals ─────────────────────────")
+    db = open_seen_db()
+    log.info("  URL index ready (%s)", SEEN_DB)
+
+    log.info("\n── Fetching articles ────────────────────────────────")
+    feed_state = load_feed_state()
+    previous_state = dict(feed_state)
+    feeds = select_feeds(args.shard)
+    if args.shard != (0, 1):
+        log.info("  Shard %d/%d: %d feeds", *args.shard, len(feeds))
+    if args.workers > 1:
+        articles = fetch_articles_sharded(feeds, feed_state, args.workers)
+    else:
+        articles = fetch_articles(feeds, feed_state)
+    # Drop URLs already in the database, and duplicates carried by several feeds.
+    known = known_urls(db, [a["url"] for a in articles])
+    articles = list({a["url"]: a for a in articles if a["url"] not in known}.values())
+    fetched = len(articles)
+    articles = [a for a in articles if is_candidate(a)]
+    for a in articles:
+        a["summary"] = a["summary"][:800].strip()
+    # Near-empty items (bare headlines, GDELT snippets) can only come back
+    # irrelevant, so they are not worth a model call.
+    gated = len(articles)
+    articles = [a for a in articles if len(a["title"]) + len(a["summary"]) >= MIN_CONTENT_CHARS]
+    log.info("\n%d new articles, %d after keyword filter, %d to classify after skipping %d too short",
+             fetched, gated, len(articles), gated - len(articles))
+
+    if not articles and not load_batch_state():
+        log.info("Nothing new to classify.")
+        save_feed_state(feed_state)
         return
 
-    print("\n── Classifying ──────────────────────────────────────")
-    new_signals = []
-    for i, article in enumerate(articles, 1):
-        print(f"  [{i}/{len(articles)}] {article['title'][:55]}...")
-        result = classify(client, article)
-        if result.get("relevant") is True:
-            new_signals.append(result)
-
-    print(f"\n{len(new_signals)} relevant signals out of {len(articles)} articles")
-    save(existing, new_signals)
+    log.info("\n── Classifying ──────────────────────────────────────")
+    cache = load_cache()
+    now = utc_now()
+    results, pending = [], []
+    for article in articles:
+        article["cache_key"] = cache_key(article)
+        if article["cache_key"] in cache:
+            results.append({**article, **cache[article["cache_key"]]["result"], "scanned_at": now})
+        else:
+            pending.append(article)
+    log.info("  %d cached, %d to send to the API", len(results), len(pending))
+
+    # Batch mode also drains batches recorded by earlier runs; if some are
+    # still running at the deadline only the verdicts already final are kept.
+    deadline = time.monotonic() + BATCH_MAX_WAIT
+    complete = True
+    if CLASSIFY_MODE == "async":
+        in_flight = {a["url"] for record in load_batch_state() for a in record["articles"]}
+        pending = [a for a in pending if a["url"] not in in_flight]
+        if pending:
+            results.extend(classify_cascade_async(pending))
+        if in_flight:
+            settled, complete = classify_batches([], deadline)
+            results.extend(settled)
+    else:
+        settled, complete = classify_batches(pending, deadline)
+        results.extend(settled)
+
+    # Entries seen this run are refreshed; ones not seen for CACHE_MAX_AGE_DAYS
+    # (feeds that answered 304 keep theirs until then) are dropped. Failed
+    # classifications are not cached; their feeds' validators are rolled back
+    # below, so the next run downloads those feeds again and retries them.
+    for r in results:
+        key = r.pop("cache_key", None) or cache_key(r)
+        if "error" not in r:
+            cache[key] = {"at": now,
+                          "result": {k: v for k, v in r.items() if k not in ARTICLE_FIELDS}}
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=CACHE_MAX_AGE_DAYS)).isoformat(timespec="seconds")
+    save_cache({k: v for k, v in cache.items() if v.get("at", "") >= cutoff})
+
+    new_signals = [r for r in results if r.get("relevant") is True]
+
+    log.info("\n%d relevant signals out of %d articles", len(new_signals), len(articles))
+    save(db, new_signals)
+
+    # A source only keeps its new ETag/Last-Modified if every one of its
+    # articles got a verdict; otherwise an unchanged feed would answer 304
+    # and the failed articles would never be fetched again. If a batch is
+    # still pending (or the run raises) nothing is saved, so the next run
+    # refetches every feed.
+    if complete:
+        failed = {r["source"] for r in results if "error" in r}
+        for source in failed:
+            if source in previous_state:
+                feed_state[source] = previous_state[source]
+            else:
+                feed_state.pop(source, None)
+        if failed:
+            log.info("  Not advancing feed state for %d sources with failed articles", len(failed))
+        save_feed_state(feed_state)
 
 if __name__ == "__main__":
     main()